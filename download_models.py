@@ -4,6 +4,8 @@ import os
 import requests
 from tqdm import tqdm
 
+from model_registry import ModelRegistry
+
 # URLs des modèles RAVE (à adapter selon disponibilité)
 MODEL_URLS = {
     "vintage": "https://github.com/acids-ircam/RAVE/releases/download/v2.3.0/vintage.ts",
@@ -53,12 +55,17 @@ def main():
         except Exception as e:
             print(f"❌ Erreur téléchargement {model_name}: {e}")
     
+    # Indexer les modèles (taille, sample rate, compression, latents, hash)
+    registry = ModelRegistry(os.path.abspath('models'))
+    registry.scan()
+
     print("\n" + "=" * 50)
     print("📋 Modèles disponibles:")
-    for f in os.listdir('models'):
-        if f.endswith('.ts'):
-            size = os.path.getsize(os.path.join('models', f)) / (1024*1024)
-            print(f"  - {f} ({size:.1f} MB)")
+    for entry in registry.entries():
+        size = entry["size"] / (1024*1024)
+        print(f"  - {entry['file']} ({size:.1f} MB, {entry['sample_rate'] or '?'} Hz, "
+              f"ratio {entry['compression_ratio'] or '?'}, {entry['latent_dims'] or '?'} latents)")
+    print(f"🗂️  Index: {registry.index_path}")
     
     # Instructions pour les modèles manquants
     print("\n⚠️  Pour les modèles Cats et Dogs:")
@@ -0,0 +1,292 @@
+# load_test.py
+# Générateur de charge pour le serveur RAVE : upload → status → download en parallèle
+import argparse
+import io
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import requests
+
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+SAMPLE_RATE = 44100
+STAGES = ("upload", "status", "download", "total")
+
+_local = threading.local()
+_clip_cache = {}
+_clip_lock = threading.Lock()
+
+
+def parse_weights(spec, cast=str):
+    """Parse "a:0.5,b:0.3,c" → ([a, b, c], [0.5, 0.3, 1.0])"""
+    values, weights = [], []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        value, _, weight = item.partition(":")
+        values.append(cast(value))
+        weights.append(float(weight) if weight else 1.0)
+    if not values:
+        raise ValueError(f"Distribution vide: {spec!r}")
+    return values, weights
+
+
+def make_clip(duration):
+    """Génère (et met en cache) un WAV mono 16 bits de `duration` secondes"""
+    with _clip_lock:
+        if duration in _clip_cache:
+            return _clip_cache[duration]
+
+    t = np.arange(int(SAMPLE_RATE * duration)) / SAMPLE_RATE
+    signal = 0.5 * np.sin(2 * np.pi * 440 * t)
+    buf = io.BytesIO()
+    with wave.open(buf, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes(np.int16(signal * 32767).tobytes())
+
+    with _clip_lock:
+        _clip_cache[duration] = buf.getvalue()
+    return _clip_cache[duration]
+
+
+def get_session():
+    """Une session HTTP par thread (keep-alive)"""
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+    return _local.session
+
+
+def run_job(server_url, model, duration, timeout):
+    """Un scénario complet ; renvoie {"latencies": {...}, "error": stage|None}"""
+    session = get_session()
+    latencies = {}
+    start = time.perf_counter()
+
+    def timed(stage, func):
+        t0 = time.perf_counter()
+        response = func()
+        latencies[stage] = time.perf_counter() - t0
+        return response
+
+    try:
+        # 1) Upload (le traitement démo est synchrone)
+        files = {'audio': (f"clip_{duration}s.wav", make_clip(duration), 'audio/wav')}
+        response = timed("upload", lambda: session.post(
+            f"{server_url}/upload", files=files, data={"model": model}, timeout=timeout))
+        if response.status_code != 200:
+            return {"latencies": latencies, "error": "upload"}
+        pid = response.json().get("process_id")
+        if not pid:
+            return {"latencies": latencies, "error": "upload"}
+
+        # 2) Status jusqu'à la fin du traitement
+        t0 = time.perf_counter()
+        while True:
+            state = session.get(f"{server_url}/status/{pid}", timeout=timeout).json()
+            if state.get("status") in ("completed", "error", "unknown"):
+                break
+            if time.perf_counter() - t0 > timeout:
+                state = {"status": "timeout"}
+                break
+            time.sleep(0.05)
+        latencies["status"] = time.perf_counter() - t0
+        if state.get("status") != "completed":
+            return {"latencies": latencies, "error": "status"}
+
+        # 3) Download du résultat de ce traitement
+        response = timed("download", lambda: session.get(
+            f"{server_url}/download", params={"pid": pid}, timeout=timeout))
+        if response.status_code != 200 or not response.content:
+            return {"latencies": latencies, "error": "download"}
+
+        latencies["total"] = time.perf_counter() - start
+        return {"latencies": latencies, "error": None}
+    except (requests.RequestException, ValueError):
+        stage = next((s for s in STAGES if s not in latencies), "total")
+        return {"latencies": latencies, "error": stage}
+
+
+def percentile(sorted_values, p):
+    """Percentile par rang le plus proche"""
+    if not sorted_values:
+        return float("nan")
+    rank = max(1, int(np.ceil(p / 100 * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+def report(results, wall_time, models):
+    """Affiche débit, latences p50/p95/p99 et taux d'erreur"""
+    total = len(results)
+    ok = sum(1 for r in results if r["error"] is None)
+
+    print("\n" + "=" * 60)
+    print("📊 RÉSULTATS")
+    print("=" * 60)
+    print(f"Requêtes: {total} | Succès: {ok} | Durée: {wall_time:.2f}s")
+    print(f"Débit: {ok / wall_time:.2f} scénarios/s" if wall_time > 0 else "Débit: N/A")
+
+    print(f"\n{'Étape':<10}{'n':>6}{'p50 (ms)':>12}{'p95 (ms)':>12}{'p99 (ms)':>12}{'erreurs':>10}")
+    for stage in STAGES:
+        values = sorted(r["latencies"][stage] for r in results if stage in r["latencies"])
+        errors = sum(1 for r in results if r["error"] == stage)
+        p50, p95, p99 = (percentile(values, p) * 1000 for p in (50, 95, 99))
+        print(f"{stage:<10}{len(values):>6}{p50:>12.1f}{p95:>12.1f}{p99:>12.1f}{errors:>10}")
+
+    print(f"\nTaux d'erreur: {(total - ok) / total * 100:.1f}%" if total else "")
+    for model in models:
+        subset = [r for r in results if r["model"] == model]
+        if subset:
+            failed = sum(1 for r in subset if r["error"] is not None)
+            print(f"  - {model}: {len(subset)} requêtes, {failed} erreurs")
+    print("=" * 60)
+
+
+def wait_for_server(server_url, timeout=30, proc=None):
+    """Attend que le serveur réponde sur / (échec immédiat si `proc` s'est arrêté)"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc is not None and proc.poll() is not None:
+            return False
+        try:
+            if requests.get(f"{server_url}/", timeout=1).status_code == 200:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def pick_port(port):
+    """Vérifie que `port` est libre (0 = port libre choisi par l'OS) ; None si occupé"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        try:
+            sock.bind(("", port))
+        except OSError:
+            return None
+        return sock.getsockname()[1]
+
+
+def stop_local_server(proc):
+    """Arrête server.py, de force s'il ne répond pas à terminate()"""
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def start_local_server(port, work_dir, models_dir=None):
+    """Lance server.py en sous-processus avec des dossiers temporaires.
+
+    Sans `models_dir`, le serveur part d'un models/ vide (modèles démo) : pas
+    d'indexation au démarrage et aucun index.json écrit dans le dépôt.
+    """
+    env = dict(os.environ)
+    env.update(
+        RAVE_PORT=str(port),
+        RAVE_UPLOAD_DIR=os.path.join(work_dir, "uploads"),
+        RAVE_OUTPUT_DIR=os.path.join(work_dir, "outputs"),
+        RAVE_MODELS_DIR=models_dir or os.path.join(work_dir, "models"),
+        PYTHONIOENCODING="utf-8",
+    )
+    log = open(os.path.join(work_dir, "server.log"), "w")
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(BASE_DIR, "server.py")],
+        env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+    return proc, log
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge du serveur RAVE")
+    parser.add_argument("--url", help="Serveur existant (sinon server.py est lancé localement)")
+    parser.add_argument("--port", type=int, default=0, help="Port du serveur local (0 = port libre)")
+    parser.add_argument("-n", "--requests", type=int, default=50, help="Nombre de scénarios")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="Scénarios en parallèle")
+    parser.add_argument("--clip-lengths", default="1:0.5,3:0.3,10:0.2",
+                        help="Durées (s) pondérées, ex: 1:0.5,3:0.3,10:0.2")
+    parser.add_argument("--models", default="Jazz,Parole,Darbouka,Chats,Chiens",
+                        help="Modèles pondérés, ex: Jazz:0.6,Parole:0.4")
+    parser.add_argument("--models-dir",
+                        help="Dossier models/ du serveur local (défaut: dossier vide, modèles démo)")
+    parser.add_argument("--startup-timeout", type=float, default=30,
+                        help="Attente max du démarrage du serveur (s), indexation comprise")
+    parser.add_argument("--timeout", type=float, default=60, help="Timeout par requête (s)")
+    parser.add_argument("--seed", type=int, help="Graine pour un tirage reproductible")
+    args = parser.parse_args()
+
+    durations, duration_weights = parse_weights(args.clip_lengths, float)
+    models, model_weights = parse_weights(args.models)
+    rng = random.Random(args.seed)
+    jobs = [
+        (rng.choices(models, model_weights)[0], rng.choices(durations, duration_weights)[0])
+        for _ in range(args.requests)
+    ]
+
+    print("=" * 60)
+    print("🏋️ TEST DE CHARGE DU SERVEUR RAVE")
+    print("=" * 60)
+
+    proc = log = work_dir = None
+    server_url = args.url
+    if not server_url:
+        port = pick_port(args.port)
+        if port is None:
+            print(f"❌ Port {args.port} déjà utilisé (utilisez --url pour viser ce serveur)")
+            sys.exit(1)
+        work_dir = tempfile.mkdtemp(prefix="rave_load_")
+        server_url = f"http://127.0.0.1:{port}"
+        print(f"🚀 Lancement de server.py sur {server_url} (dossiers: {work_dir})")
+        proc, log = start_local_server(port, work_dir, args.models_dir)
+
+    try:
+        if not wait_for_server(server_url, args.startup_timeout, proc):
+            print(f"❌ Serveur injoignable: {server_url}")
+            if proc and proc.poll() is not None:
+                print(f"   server.py s'est arrêté (code {proc.returncode}), "
+                      f"voir {os.path.join(work_dir, 'server.log')}")
+            sys.exit(1)
+
+        # Pré-générer les clips hors mesure
+        for duration in set(durations):
+            make_clip(duration)
+
+        print(f"📤 {args.requests} scénarios, concurrence {args.concurrency}")
+        print(f"   Durées: {dict(zip(durations, duration_weights))}")
+        print(f"   Modèles: {dict(zip(models, model_weights))}")
+
+        results = []
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            futures = {
+                pool.submit(run_job, server_url, model, duration, args.timeout): model
+                for model, duration in jobs
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                result["model"] = futures[future]
+                results.append(result)
+        wall_time = time.perf_counter() - start
+
+        report(results, wall_time, models)
+    finally:
+        if proc:
+            stop_local_server(proc)
+            log.close()
+            print(f"🛑 Serveur local arrêté (log: {os.path.join(work_dir, 'server.log')})")
+
+
+if __name__ == "__main__":
+    main()
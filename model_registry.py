@@ -0,0 +1,216 @@
+# model_registry.py
+# Catalogue des modèles RAVE présents dans models/ (métadonnées + index d'intégrité)
+import argparse
+import hashlib
+import json
+import os
+import threading
+
+BASE_DIR    = os.path.abspath(os.path.dirname(__file__))
+MODELS_DIR  = os.environ.get("RAVE_MODELS_DIR", os.path.join(BASE_DIR, "models"))
+INDEX_NAME  = "index.json"
+MODEL_EXTS  = (".ts", ".onnx")  # ordre de priorité si deux fichiers ont le même nom
+INDEX_VERSION = 1
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """Hash SHA-256 d'un fichier, lu par blocs"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def inspect_model(path):
+    """Lit sample rate, ratio de compression et dimensions latentes d'un export RAVE (.ts).
+
+    Le modèle n'est chargé qu'à l'indexation ; ensuite tout est lu depuis l'index.
+    Renvoie des None si torch est absent, si le modèle n'expose pas ces attributs,
+    et toujours pour les .onnx (inspection non supportée : seuls taille et hash sont indexés).
+    """
+    meta = {"sample_rate": None, "compression_ratio": None, "latent_dims": None}
+    if not path.endswith(".ts"):
+        return meta
+    try:
+        import torch
+        model = torch.jit.load(path, map_location='cpu')
+    except Exception as e:
+        print(f"⚠️  Inspection impossible ({os.path.basename(path)}): {e}")
+        return meta
+
+    if hasattr(model, "sr"):
+        meta["sample_rate"] = int(model.sr)
+    # encode_params = [canaux entrée, ratio entrée, taille latente, ratio compression]
+    if hasattr(model, "encode_params"):
+        params = [int(p) for p in model.encode_params]
+        if len(params) >= 4:
+            meta["latent_dims"] = params[2]
+            meta["compression_ratio"] = params[3]
+    return meta
+
+
+class ModelRegistry:
+    """Index des modèles sur disque, persisté dans models/index.json.
+
+    - scan() parcourt models/ une fois ; les fichiers inchangés (taille + mtime)
+      reprennent leur entrée d'index sans être relus ni rechargés. Un fichier
+      déjà indexé dont le contenu a changé garde son hash de référence et est
+      marqué "modified" : seul scan(reindex=True) le ré-approuve.
+    - validate() recalcule le hash à la première utilisation d'un modèle et le
+      compare à l'index. Le résultat est mis en cache tant que taille et mtime
+      du fichier ne changent pas (une réécriture à taille et mtime identiques
+      n'est donc détectée qu'au prochain redémarrage).
+    """
+
+    def __init__(self, models_dir=MODELS_DIR, index_path=None):
+        self.models_dir = models_dir
+        self.index_path = index_path or os.path.join(models_dir, INDEX_NAME)
+        self.models = {}
+        self._validated = {}
+        self._name_locks = {}
+        self._lock = threading.Lock()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if index.get("version") != INDEX_VERSION:
+            return {}
+        return index.get("models", {})
+
+    def _save_index(self):
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "models": self.models}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    def _model_files(self):
+        """{nom: fichier} ; un seul fichier par nom, .ts prioritaire sur .onnx"""
+        files = {}
+        if not os.path.isdir(self.models_dir):
+            return files
+        candidates = [f for f in os.listdir(self.models_dir) if f.endswith(MODEL_EXTS)]
+        candidates.sort(key=lambda f: (os.path.splitext(f)[0], MODEL_EXTS.index(os.path.splitext(f)[1])))
+        for filename in candidates:
+            name = os.path.splitext(filename)[0]
+            if name in files:
+                print(f"⚠️  {filename} ignoré : {files[name]} porte déjà le nom {name}")
+                continue
+            files[name] = filename
+        return files
+
+    def _index_entry(self, path, stat):
+        print(f"🔎 Indexation de {os.path.basename(path)}...")
+        entry = {
+            "file":   os.path.basename(path),
+            "size":   stat.st_size,
+            "mtime":  stat.st_mtime,
+            "sha256": file_sha256(path),
+        }
+        entry.update(inspect_model(path))
+        return entry
+
+    def scan(self, reindex=False):
+        """Parcourt models/, met à jour l'index et le réécrit si besoin.
+
+        reindex=True ré-approuve tous les fichiers présents (nouveau hash de référence).
+        """
+        with self._lock:
+            previous = self._load_index()
+            models = {}
+            for name, filename in self._model_files().items():
+                path = os.path.join(self.models_dir, filename)
+                stat = os.stat(path)
+                entry = previous.get(name)
+                known = entry is not None and entry.get("file") == filename
+
+                if reindex or not known:
+                    models[name] = self._index_entry(path, stat)
+                elif entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime:
+                    models[name] = {k: v for k, v in entry.items() if k != "modified"}
+                elif file_sha256(path) == entry["sha256"]:
+                    # Simple changement de mtime : contenu identique
+                    models[name] = dict(entry, size=stat.st_size, mtime=stat.st_mtime)
+                    models[name].pop("modified", None)
+                else:
+                    print(f"❌ {filename} modifié depuis l'indexation : hash de référence conservé "
+                          f"(python model_registry.py --reindex pour l'accepter)")
+                    models[name] = dict(entry, modified=True)
+
+            changed = models != previous
+            self.models = models
+            self._validated = {}
+            if changed:
+                self._save_index()
+            return self.models
+
+    def names(self):
+        return list(self.models)
+
+    def get(self, name):
+        return self.models.get(name)
+
+    def entries(self):
+        """Liste des entrées de l'index (avec le nom), pour /getmodels?details=1"""
+        return [dict(entry, name=name) for name, entry in self.models.items()]
+
+    def path(self, name):
+        entry = self.models.get(name)
+        return os.path.join(self.models_dir, entry["file"]) if entry else None
+
+    def validate(self, name):
+        """Vérifie que le fichier correspond au hash de l'index (hash recalculé si taille/mtime changent)"""
+        with self._lock:
+            entry = self.models.get(name)
+            name_lock = self._name_locks.setdefault(name, threading.Lock())
+        if entry is None:
+            return False
+
+        # Verrou par modèle : le hash d'un gros fichier ne bloque pas les autres modèles
+        with name_lock:
+            path = self.path(name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                stat = None
+            key = (stat.st_size, stat.st_mtime) if stat else None
+
+            with self._lock:
+                cached = self._validated.get(name)
+            if cached and key and cached[0] == key:
+                return cached[1]
+
+            try:
+                valid = key is not None and file_sha256(path) == entry["sha256"]
+            except OSError:
+                valid = False
+            if not valid:
+                print(f"❌ Modèle {name} absent ou corrompu (hash différent de l'index)")
+
+            with self._lock:
+                self._validated[name] = (key, valid)
+            return valid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Indexe les modèles RAVE de models/")
+    parser.add_argument("--models-dir", default=MODELS_DIR, help="Dossier des modèles")
+    parser.add_argument("--reindex", action="store_true",
+                        help="Ré-approuver tous les fichiers (nouveau hash de référence)")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(os.path.abspath(args.models_dir))
+    registry.scan(reindex=args.reindex)
+    print("📋 Modèles indexés:")
+    for entry in registry.entries():
+        flag = " ⚠️ modifié" if entry.get("modified") else ""
+        print(f"  - {entry['name']} ({entry['file']}, {entry['size'] / (1024*1024):.1f} MB){flag}")
+    print(f"🗂️  Index: {registry.index_path}")
+
+
+if __name__ == "__main__":
+    main()
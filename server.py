@@ -9,20 +9,27 @@ import traceback
 from uuid import uuid4
 import shutil
 from process_rave_demo import apply_effect  # votre script DÉMO
+from model_registry import ModelRegistry
 
 app = Flask(__name__)
 CORS(app)
 
 # --- Dossiers ---
 BASE_DIR    = os.path.abspath(os.path.dirname(__file__))
-UPLOAD_DIR  = os.path.join(BASE_DIR, "uploads")
-OUTPUT_DIR  = os.path.join(BASE_DIR, "outputs")
+UPLOAD_DIR  = os.environ.get("RAVE_UPLOAD_DIR", os.path.join(BASE_DIR, "uploads"))
+OUTPUT_DIR  = os.environ.get("RAVE_OUTPUT_DIR", os.path.join(BASE_DIR, "outputs"))
+PORT        = int(os.environ.get("RAVE_PORT", 5000))
 for d in (UPLOAD_DIR, OUTPUT_DIR):
     os.makedirs(d, exist_ok=True)
 
 # --- Modèle par défaut / état global ---
 SELECTED_MODEL    = "Jazz"
 PROCESSING_STATUS = {}
+DEMO_MODELS       = ["Jazz", "Parole", "Darbouka", "Chats", "Chiens"]
+
+# --- Catalogue des modèles (scan unique de models/ au démarrage) ---
+REGISTRY = ModelRegistry()
+REGISTRY.scan()
 
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50 Mo max
 
@@ -34,13 +41,22 @@ def root():
 
 @app.route("/getmodels")
 def get_models():
-    """Liste statique des modèles (mode démo)."""
-    return jsonify(["Jazz", "Parole", "Darbouka", "Chats", "Chiens"])
+    """Modèles de l'index models/ (liste démo si aucun) ; ?details=1 pour les métadonnées."""
+    entries = REGISTRY.entries() or [
+        {"name": name, "file": None, "size": None, "sha256": None, "sample_rate": None,
+         "compression_ratio": None, "latent_dims": None, "demo": True}
+        for name in DEMO_MODELS
+    ]
+    if request.args.get("details", "").lower() in ("1", "true"):
+        return jsonify(entries)
+    return jsonify([entry["name"] for entry in entries])
 
 
 @app.route("/selectModel/<modelname>")
 def select_model(modelname: str):
     global SELECTED_MODEL
+    if REGISTRY.get(modelname) and not REGISTRY.validate(modelname):
+        return jsonify({"status": "error", "msg": f"Modèle {modelname} corrompu"}), 409
     SELECTED_MODEL = modelname
     print(f"🎯 Modèle sélectionné (mode démo) : {SELECTED_MODEL}")
     return jsonify({"status": "ok", "model": SELECTED_MODEL})
@@ -61,6 +77,12 @@ def upload():
     if not file_obj:
         return jsonify({"status": "error", "msg": "Aucun fichier audio trouvé"}), 400
 
+    # Modèle propre à la requête (sinon modèle global sélectionné)
+    model_name = request.form.get("model") or SELECTED_MODEL
+    if REGISTRY.get(model_name) and not REGISTRY.validate(model_name):
+        PROCESSING_STATUS[pid].update(status="error")
+        return jsonify({"status": "error", "msg": f"Modèle {model_name} corrompu"}), 409
+
     # 2) Sauvegarde temporaire
     input_name  = f"{pid}_{file_obj.filename}"
     input_path  = os.path.join(UPLOAD_DIR, input_name)
@@ -75,8 +97,8 @@ def upload():
 
     # 4) Appel direct du mode DÉMO
     try:
-        print(f"🚀 DÉMO intégré: apply_effect({SELECTED_MODEL})")
-        apply_effect(input_path, output_path, SELECTED_MODEL)
+        print(f"🚀 DÉMO intégré: apply_effect({model_name})")
+        apply_effect(input_path, output_path, model_name)
         PROCESSING_STATUS[pid].update(status="completed", progress=100)
         # Nettoyer l'upload
         os.remove(input_path)
@@ -104,7 +126,14 @@ def upload():
 
 @app.route("/download")
 def download():
-    """Renvoie le dernier fichier transformé."""
+    """Renvoie le fichier transformé d'un traitement (?pid=) ou le dernier."""
+    pid = request.args.get("pid")
+    if pid:
+        path = os.path.join(OUTPUT_DIR, f"transformed_{os.path.basename(pid)}.wav")
+        if not os.path.exists(path):
+            return jsonify({"status": "error", "msg": "Fichier introuvable"}), 404
+        return send_file(path, as_attachment=True, download_name="transformed.wav", mimetype="audio/wav")
+
     # Trouver le plus récent dans outputs
     wavs = [f for f in os.listdir(OUTPUT_DIR) if f.endswith(".wav")]
     if not wavs:
@@ -141,11 +170,13 @@ def info():
     return jsonify({
         "server":         "RAVE DEMO INTÉGRÉ",
         "selected_model": SELECTED_MODEL,
+        "models_dir":     REGISTRY.models_dir,
+        "indexed_models": REGISTRY.names(),
         "upload_dir":     UPLOAD_DIR,
         "output_dir":     OUTPUT_DIR
     })
 
 
 if __name__ == "__main__":
-    print("🚀 Serveur RAVE DÉMO démarré sur http://0.0.0.0:5000")
-    app.run(host="0.0.0.0", port=5000, debug=False)
+    print(f"🚀 Serveur RAVE DÉMO démarré sur http://0.0.0.0:{PORT}")
+    app.run(host="0.0.0.0", port=PORT, debug=False, threaded=True)
@@ -0,0 +1,145 @@
+# test_model_registry.py
+# Vérifications de l'index des modèles (model_registry.py), sans serveur ni torch
+import json
+import os
+import shutil
+import tempfile
+
+import model_registry
+from model_registry import ModelRegistry
+
+
+def write_model(models_dir, filename, content, mtime=None):
+    """Écrit un faux modèle ; `mtime` force une date de modification distincte"""
+    path = os.path.join(models_dir, filename)
+    with open(path, 'wb') as f:
+        f.write(content)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def make_registry():
+    models_dir = tempfile.mkdtemp(prefix="rave_models_")
+    return ModelRegistry(models_dir), models_dir
+
+
+def test_unchanged_file_reuses_entry():
+    """Un fichier inchangé reprend son entrée sans être re-hashé"""
+    registry, models_dir = make_registry()
+    try:
+        write_model(models_dir, "Jazz.ts", b"jazz", mtime=1000)
+        registry.scan()
+
+        hashed = []
+        original = model_registry.file_sha256
+        model_registry.file_sha256 = lambda path: hashed.append(path) or original(path)
+        try:
+            entry = ModelRegistry(models_dir).scan()["Jazz"]
+        finally:
+            model_registry.file_sha256 = original
+        assert hashed == []
+        assert entry["size"] == len(b"jazz")
+    finally:
+        shutil.rmtree(models_dir)
+
+
+def test_changed_file_keeps_reference_hash():
+    """Un fichier modifié garde son hash de référence jusqu'à scan(reindex=True)"""
+    registry, models_dir = make_registry()
+    try:
+        write_model(models_dir, "Jazz.ts", b"jazz", mtime=1000)
+        reference = registry.scan()["Jazz"]["sha256"]
+
+        write_model(models_dir, "Jazz.ts", b"truncated", mtime=2000)
+        registry = ModelRegistry(models_dir)
+        entry = registry.scan()["Jazz"]
+        assert entry["sha256"] == reference
+        assert entry["modified"] is True
+        assert not registry.validate("Jazz")
+        with open(registry.index_path, encoding="utf-8") as f:
+            assert json.load(f)["models"]["Jazz"]["sha256"] == reference
+
+        entry = registry.scan(reindex=True)["Jazz"]
+        assert entry["sha256"] != reference
+        assert entry["size"] == len(b"truncated")
+        assert "modified" not in entry
+        assert registry.validate("Jazz")
+    finally:
+        shutil.rmtree(models_dir)
+
+
+def test_touched_file_is_not_flagged():
+    """Un simple changement de mtime (contenu identique) n'est pas signalé"""
+    registry, models_dir = make_registry()
+    try:
+        write_model(models_dir, "Jazz.ts", b"jazz", mtime=1000)
+        registry.scan()
+        write_model(models_dir, "Jazz.ts", b"jazz", mtime=2000)
+        entry = ModelRegistry(models_dir).scan()["Jazz"]
+        assert entry["mtime"] == 2000
+        assert "modified" not in entry
+    finally:
+        shutil.rmtree(models_dir)
+
+
+def test_validate_catches_same_size_change():
+    """validate() détecte un contenu différent de même taille, même après un premier succès"""
+    registry, models_dir = make_registry()
+    try:
+        write_model(models_dir, "Parole.ts", b"aaaa", mtime=1000)
+        registry.scan()
+        assert registry.validate("Parole")
+
+        write_model(models_dir, "Parole.ts", b"bbbb", mtime=2000)
+        assert not registry.validate("Parole")
+    finally:
+        shutil.rmtree(models_dir)
+
+
+def test_validate_missing_file():
+    """Un fichier supprimé (ou un nom inconnu) n'est pas valide"""
+    registry, models_dir = make_registry()
+    try:
+        path = write_model(models_dir, "Chiens.ts", b"wouf")
+        registry.scan()
+        os.remove(path)
+        assert not registry.validate("Chiens")
+        assert not registry.validate("Inconnu")
+    finally:
+        shutil.rmtree(models_dir)
+
+
+def test_duplicate_names_prefer_ts():
+    """Jazz.ts et Jazz.onnx : un seul modèle, le .ts"""
+    registry, models_dir = make_registry()
+    try:
+        write_model(models_dir, "Jazz.onnx", b"onnx")
+        write_model(models_dir, "Jazz.ts", b"ts")
+        models = registry.scan()
+        assert list(models) == ["Jazz"]
+        assert models["Jazz"]["file"] == "Jazz.ts"
+    finally:
+        shutil.rmtree(models_dir)
+
+
+def main():
+    """Lance les vérifications sans pytest"""
+    print("=" * 60)
+    print("🧪 TEST DE L'INDEX DES MODÈLES")
+    print("=" * 60)
+    failed = 0
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            try:
+                func()
+                print(f"✅ {func.__doc__}")
+            except Exception as e:
+                failed += 1
+                print(f"❌ {func.__doc__}: {e!r}")
+    print("=" * 60)
+    print("✅ Tests terminés !" if not failed else f"❌ {failed} test(s) en échec")
+
+
+if __name__ == "__main__":
+    main()
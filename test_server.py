@@ -49,10 +49,14 @@ def test_server_info():
         if response.status_code == 200:
             info = response.json()
             print(f"✅ Infos serveur:")
-            print(f"   - Version: {info.get('version', 'N/A')}")
+            print(f"   - Serveur: {info.get('server', 'N/A')}")
             print(f"   - Modèle actuel: {info.get('selected_model', 'N/A')}")
-            print(f"   - Modèles trouvés: {info.get('available_models', [])}")
-            print(f"   - Script process_rave.py: {'✅ Présent' if info.get('process_script_exists') else '❌ Manquant'}")
+            print(f"   - Dossier uploads: {info.get('upload_dir', 'N/A')}")
+            print(f"   - Dossier outputs: {info.get('output_dir', 'N/A')}")
+            missing = [k for k in ("server", "selected_model", "upload_dir", "output_dir") if k not in info]
+            if missing:
+                print(f"❌ Champs manquants: {missing}")
+                return False
             return True
         else:
             print(f"❌ Erreur: {response.status_code}")